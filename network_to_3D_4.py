@@ -1,83 +1,148 @@
 import csv
+import functools
+import hashlib
 import json
-import random
 import math
 import os
 import unicodedata
 import re
+import shutil
+from collections import Counter
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
 
 # === CONFIGURATION ===
 CSV_FILE = 'skills-data.csv'
 OUTPUT_JSON = 'network_3d.json'
 OUTPUT_OBJ = 'network_3d.obj'
 
-# Layout algorithm: 'force' or 'sphere' or 'hierarchical'
+# Layouts are cached here (next to the CSV) and reused while inputs are unchanged
+USE_CACHE = True
+CACHE_DIR = '.cache'
+
+# Layout algorithm: 'force', 'lbfgs', 'sphere' or 'hierarchical'
 LAYOUT = 'force'
 
+# Seed for the random initial node positions
+RANDOM_SEED = 0
+
 # Force-directed parameters
 ITERATIONS = 100
 SPRING_LENGTH = 3.0
 REPULSION_STRENGTH = 50.0
 
+# Barnes-Hut approximation (used for large graphs when numba is available)
+BARNES_HUT_THETA = 0.5
+BARNES_HUT_MIN_NODES = 500
+
+# L-BFGS energy minimization parameters (LAYOUT = 'lbfgs', requires scipy)
+LBFGS_MAXITER = 50
+SPRING_CONSTANT = 0.1
+
+# Trailing " (Some%20File.csv)" / ".md" export suffix on relation names
+_URL_SUFFIX_RE = re.compile(r'\s+\([^()]*%.*?\.(?:csv|md)\)\s*$')
+
+# Familiarity scale
+_FAM_MAP = {
+    '🏆 Profissional': 5, '🏆': 5,
+    '💪 Confiante': 4, '💪': 4,
+    '📚 Familiar': 3, '📚': 3,
+    '🌱 Iniciante': 2, '🌱': 2,
+    '❓ Desconhecida': 1, '❓': 1
+}
+
+# Interest/Market scale
+_INT_MAP = {
+    '⭐': 5, '🔥': 4, '👍': 3, '😐': 2, '🤷': 1
+}
+
+_EMOJI_LOOKUP = {**_FAM_MAP, **_INT_MAP}
+
+# Longest keys first so '🏆 Profissional' wins over '🏆'
+_EMOJI_RE = re.compile('|'.join(map(re.escape, sorted(_EMOJI_LOOKUP, key=len, reverse=True))))
+
+# When several emoji appear, the first key in map order wins (familiarity before interest)
+_EMOJI_RANK = {key: i for i, key in enumerate(_EMOJI_LOOKUP)}
+
+@functools.lru_cache(maxsize=256)
 def emoji_to_num(emoji_str):
     """Convert emoji to numeric value"""
     if not emoji_str:
         return 0
     
-    # Familiarity scale
-    fam_map = {
-        '🏆 Profissional': 5, '🏆': 5,
-        '💪 Confiante': 4, '💪': 4,
-        '📚 Familiar': 3, '📚': 3,
-        '🌱 Iniciante': 2, '🌱': 2,
-        '❓ Desconhecida': 1, '❓': 1
-    }
-    
-    # Interest/Market scale
-    int_map = {
-        '⭐': 5, '🔥': 4, '👍': 3, '😐': 2, '🤷': 1
-    }
-    
     emoji_str = str(emoji_str).strip()
     
-    if emoji_str in fam_map:
-        return fam_map[emoji_str]
-    if emoji_str in int_map:
-        return int_map[emoji_str]
+    value = _EMOJI_LOOKUP.get(emoji_str)
+    if value is not None:
+        return value
     
     # Try to extract just the emoji
-    for key in fam_map:
-        if key in emoji_str:
-            return fam_map[key]
-    for key in int_map:
-        if key in emoji_str:
-            return int_map[key]
+    matches = [m.group() for m in _EMOJI_RE.finditer(emoji_str)]
+    if matches:
+        return _EMOJI_LOOKUP[min(matches, key=_EMOJI_RANK.__getitem__)]
     
     return 0
 
+@functools.lru_cache(maxsize=256)
+def normalize_key(s):
+    """Normalize a header name for accent/case-insensitive matching"""
+    if s is None:
+        return ''
+    s = str(s)
+    s = unicodedata.normalize('NFKD', s)
+    s = ''.join(ch for ch in s if not unicodedata.combining(ch))
+    return s.strip().lower()
+
+def _parse_score(value):
+    """Parse a numeric score cell, treating blank or invalid values as 0"""
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+def resolve_csv_path(csv_file):
+    """Resolve the CSV path relative to this script and check it exists"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    csv_path = csv_file if os.path.isabs(csv_file) else os.path.join(script_dir, csv_file)
+    
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    
+    return csv_path
+
+def layout_cache_path(csv_file):
+    """Cache file for the exported JSON, keyed by CSV contents, layout config and this script"""
+    csv_path = resolve_csv_path(csv_file)
+    config = (LAYOUT, RANDOM_SEED, ITERATIONS, SPRING_LENGTH, REPULSION_STRENGTH,
+              BARNES_HUT_THETA, BARNES_HUT_MIN_NODES, LBFGS_MAXITER, SPRING_CONSTANT)
+    digest = hashlib.sha1(repr(config).encode())
+    with open(csv_path, 'rb') as f:
+        digest.update(f.read())
+    # Any change to parsing, layout or export code invalidates old entries
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    key = digest.hexdigest()
+    cache_dir = os.path.join(os.path.dirname(csv_path), CACHE_DIR)
+    return os.path.join(cache_dir, f'network_{key}.json')
+
 def load_network(csv_file):
     """Load nodes and edges from CSV"""
     nodes = {}
     temp_dependencies = {}  # Store deps temporarily
     temp_requirements = {}  # Store reqs temporarily
     
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    csv_path = csv_file if os.path.isabs(csv_file) else os.path.join(script_dir, csv_file)
-    
-    if not os.path.exists(csv_path):
-        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    csv_path = resolve_csv_path(csv_file)
     
     with open(csv_path, 'r', encoding='utf-8-sig') as f:
         reader = csv.DictReader(f)
         
-        def normalize_key(s):
-            if s is None:
-                return ''
-            s = str(s)
-            s = unicodedata.normalize('NFKD', s)
-            s = ''.join(ch for ch in s if not unicodedata.combining(ch))
-            return s.strip().lower()
-        
         header_map = {}
         if reader.fieldnames:
             for h in reader.fieldnames:
@@ -114,6 +179,13 @@ def load_network(csv_file):
             elif 'dep' in norm_key and 'indirect' in norm_key:
                 dep_indirect_key = actual_key
         
+        score_cols = [(dest_key, src_key) for dest_key, src_key in (
+            ('req_score', req_score_key),
+            ('master_score', master_score_key),
+            ('req_indirect', req_indirect_key),
+            ('dep_indirect', dep_indirect_key),
+        ) if src_key]
+        
         print(f"Column mapping:")
         print(f"  Name: {name_key}")
         print(f"  Dependencies: {deps_key}")
@@ -145,35 +217,15 @@ def load_network(csv_file):
                 'master_score': 0,
                 'req_indirect': 0,
                 'dep_indirect': 0,
-                'x': random.uniform(-10, 10),
-                'y': random.uniform(-10, 10),
-                'z': random.uniform(-10, 10)
+                'x': 0.0,  # Filled from the bulk random draw below
+                'y': 0.0,
+                'z': 0.0
             }
             
             # Get scores from database if available
-            if req_score_key:
-                try:
-                    nodes[name]['req_score'] = float(row.get(req_score_key, 0) or 0)
-                except (ValueError, TypeError):
-                    pass
-            
-            if master_score_key:
-                try:
-                    nodes[name]['master_score'] = float(row.get(master_score_key, 0) or 0)
-                except (ValueError, TypeError):
-                    pass
-            
-            if req_indirect_key:
-                try:
-                    nodes[name]['req_indirect'] = float(row.get(req_indirect_key, 0) or 0)
-                except (ValueError, TypeError):
-                    pass
-            
-            if dep_indirect_key:
-                try:
-                    nodes[name]['dep_indirect'] = float(row.get(dep_indirect_key, 0) or 0)
-                except (ValueError, TypeError):
-                    pass
+            node = nodes[name]
+            for dest_key, src_key in score_cols:
+                node[dest_key] = _parse_score(row.get(src_key))
             
             # Store dependencies temporarily
             if deps_key:
@@ -187,36 +239,41 @@ def load_network(csv_file):
                 if reqs_raw:
                     temp_requirements[name] = reqs_raw
     
+    # Random initial positions, drawn in one call
+    rng = np.random.default_rng(RANDOM_SEED)
+    coords = rng.uniform(-10, 10, size=(len(nodes), 3))
+    for node, (x, y, z) in zip(nodes.values(), coords.tolist()):
+        node['x'], node['y'], node['z'] = x, y, z
+    
     # Now create edges after all nodes are loaded
     edges = []
+    edge_set = set()  # (source, target) pairs already in edges
     
     def parse_relations(raw_str):
         """Parse comma-separated relations, handling parentheses"""
         targets = []
-        current = ''
+        current = []
         paren_depth = 0
         
-        for char in raw_str:
-            if char == '(':
-                paren_depth += 1
-                current += char
-            elif char == ')':
-                paren_depth -= 1
-                current += char
-            elif char == ',' and paren_depth == 0:
-                if current.strip():
-                    targets.append(current.strip())
-                current = ''
-            else:
-                current += char
+        # Split on every comma, then re-join pieces that fall inside parentheses
+        for piece in raw_str.split(','):
+            current.append(piece)
+            paren_depth += piece.count('(') - piece.count(')')
+            if paren_depth == 0:
+                target = ','.join(current).strip()
+                if target:
+                    targets.append(target)
+                current = []
         
-        if current.strip():
-            targets.append(current.strip())
+        if current:
+            target = ','.join(current).strip()
+            if target:
+                targets.append(target)
         
         # Clean each target by removing URL-encoded filenames
         clean_targets = []
         for target in targets:
-            clean_name = re.sub(r'\s+\([^()]*%.*?\.(csv|md)\)\s*$', '', target, flags=re.DOTALL).strip()
+            clean_name = _URL_SUFFIX_RE.sub('', target).strip()
             if clean_name:
                 clean_targets.append(clean_name)
         
@@ -228,6 +285,7 @@ def load_network(csv_file):
         for target_name in targets:
             if target_name in nodes:
                 edges.append({'source': target_name, 'target': source_name})
+                edge_set.add((target_name, source_name))
             else:
                 print(f"Warning: '{source_name}' depends on '{target_name}' but '{target_name}' not found")
     
@@ -237,68 +295,331 @@ def load_network(csv_file):
         for target_name in targets:
             if target_name in nodes:
                 # Check if edge already exists
-                if not any(e['source'] == source_name and e['target'] == target_name for e in edges):
+                if (source_name, target_name) not in edge_set:
                     edges.append({'source': source_name, 'target': target_name})
+                    edge_set.add((source_name, target_name))
             else:
                 print(f"Warning: '{source_name}' required by '{target_name}' but '{target_name}' not found")
     
     # Calculate direct counts from edges
-    for node in nodes.values():
-        node['req_direct'] = sum(1 for e in edges if e['source'] == node['name'])
-        node['dep_direct'] = sum(1 for e in edges if e['target'] == node['name'])
+    out_deg = Counter(e['source'] for e in edges)
+    in_deg = Counter(e['target'] for e in edges)
+    for name, node in nodes.items():
+        node['req_direct'] = out_deg[name]
+        node['dep_direct'] = in_deg[name]
     
     return list(nodes.values()), edges
 
-def apply_layout(nodes, edges, layout_type='force'):
-    """Apply layout algorithm"""
-    if layout_type == 'force':
-        for _ in range(ITERATIONS):
-            # Repulsion
-            for i, n1 in enumerate(nodes):
-                fx, fy, fz = 0, 0, 0
-                for j, n2 in enumerate(nodes):
-                    if i == j:
-                        continue
-                    dx = n1['x'] - n2['x']
-                    dy = n1['y'] - n2['y']
-                    dz = n1['z'] - n2['z']
-                    dist = math.sqrt(dx*dx + dy*dy + dz*dz) + 0.1
-                    force = REPULSION_STRENGTH / (dist * dist)
-                    fx += (dx / dist) * force
-                    fy += (dy / dist) * force
-                    fz += (dz / dist) * force
-                
-                n1['x'] += fx * 0.01
-                n1['y'] += fy * 0.01
-                n1['z'] += fz * 0.01
-            
-            # Spring attraction
-            for edge in edges:
-                source = next((n for n in nodes if n['name'] == edge['source']), None)
-                target = next((n for n in nodes if n['name'] == edge['target']), None)
-                if not source or not target:
+def _force_iter_numpy(pos, src, tgt, repulsion, spring_len):
+    """One force-directed step on an (n, 3) position buffer, in place"""
+    # Repulsion
+    delta = pos[:, None, :] - pos[None, :, :]
+    dist2 = (delta * delta).sum(-1) + 0.01
+    inv = repulsion / (dist2 * np.sqrt(dist2))
+    np.fill_diagonal(inv, 0.0)
+    forces = (delta * inv[..., None]).sum(axis=1)
+    pos += 0.01 * forces
+    
+    # Spring attraction
+    d = pos[tgt] - pos[src]
+    dist = np.linalg.norm(d, axis=1, keepdims=True) + 0.1
+    f = d * ((dist - spring_len) * 0.1 / dist)
+    np.add.at(pos, src, f)
+    np.add.at(pos, tgt, -f)
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _apply_springs(pos, src, tgt, spring_len):
+        """Spring attraction, all edges evaluated on the same positions"""
+        m = src.shape[0]
+        
+        # Per-edge forces are buffered so the step matches _force_iter_numpy
+        spring = np.empty((m, 3), dtype=np.float32)
+        for k in numba.prange(m):
+            s = src[k]
+            t = tgt[k]
+            dx = pos[t, 0] - pos[s, 0]
+            dy = pos[t, 1] - pos[s, 1]
+            dz = pos[t, 2] - pos[s, 2]
+            dist = math.sqrt(dx*dx + dy*dy + dz*dz) + 0.1
+            f = (dist - spring_len) * 0.1 / dist
+            spring[k, 0] = dx * f
+            spring[k, 1] = dy * f
+            spring[k, 2] = dz * f
+        
+        # Scatter serially: both endpoints are written to
+        for k in range(m):
+            s = src[k]
+            t = tgt[k]
+            for c in range(3):
+                pos[s, c] += spring[k, c]
+                pos[t, c] -= spring[k, c]
+    
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _force_iter(pos, src, tgt, repulsion, spring_len):
+        """One force-directed step on an (n, 3) position buffer, in place"""
+        n = pos.shape[0]
+        
+        # Repulsion (forces are buffered so every row reads the same positions)
+        forces = np.zeros((n, 3), dtype=np.float32)
+        for i in numba.prange(n):
+            fx = fy = fz = 0.0
+            for j in range(n):
+                if i == j:
                     continue
+                dx = pos[i, 0] - pos[j, 0]
+                dy = pos[i, 1] - pos[j, 1]
+                dz = pos[i, 2] - pos[j, 2]
+                inv_d = 1.0 / math.sqrt(dx*dx + dy*dy + dz*dz + 0.01)
+                f = repulsion * inv_d * inv_d * inv_d
+                fx += dx * f
+                fy += dy * f
+                fz += dz * f
+            forces[i, 0] = fx
+            forces[i, 1] = fy
+            forces[i, 2] = fz
+        for i in numba.prange(n):
+            for c in range(3):
+                pos[i, c] += 0.01 * forces[i, c]
+        
+        _apply_springs(pos, src, tgt, spring_len)
+    
+    @numba.njit(cache=True)
+    def _build_octree(pos):
+        """Build a Barnes-Hut octree over pos.
+        
+        Cells are stored as flat arrays indexed by cell id (root is 0):
+        com (centre of mass), size (edge length), mass (node count) and
+        children (8 child ids, -1 when empty).
+        """
+        n = pos.shape[0]
+        cap = 2 * n + 8
+        center = np.zeros((cap, 3))
+        com = np.zeros((cap, 3))
+        size = np.zeros(cap)
+        mass = np.zeros(cap)
+        children = np.full((cap, 8), -1, dtype=np.int32)
+        body = np.full(cap, -1, dtype=np.int32)
+        
+        lo = np.empty(3)
+        hi = np.empty(3)
+        for c in range(3):
+            lo[c] = pos[:, c].min()
+            hi[c] = pos[:, c].max()
+        extent = max(hi[0] - lo[0], hi[1] - lo[1], hi[2] - lo[2]) + 1e-3
+        for c in range(3):
+            center[0, c] = 0.5 * (lo[c] + hi[c])
+        size[0] = extent
+        count = 1
+        
+        for b in range(n):
+            cell = 0
+            while True:
+                # Make room for up to two new cells
+                if count + 2 > cap:
+                    cap *= 2
+                    center = np.concatenate((center, np.zeros((cap - center.shape[0], 3))))
+                    com = np.concatenate((com, np.zeros((cap - com.shape[0], 3))))
+                    size = np.concatenate((size, np.zeros(cap - size.shape[0])))
+                    mass = np.concatenate((mass, np.zeros(cap - mass.shape[0])))
+                    children = np.concatenate(
+                        (children, np.full((cap - children.shape[0], 8), -1, dtype=np.int32)))
+                    body = np.concatenate((body, np.full(cap - body.shape[0], -1, dtype=np.int32)))
                 
-                dx = target['x'] - source['x']
-                dy = target['y'] - source['y']
-                dz = target['z'] - source['z']
-                dist = math.sqrt(dx*dx + dy*dy + dz*dz) + 0.1
-                force = (dist - SPRING_LENGTH) * 0.1
+                if mass[cell] == 0.0:
+                    # Empty leaf
+                    body[cell] = b
+                    mass[cell] = 1.0
+                    for c in range(3):
+                        com[cell, c] = pos[b, c]
+                    break
                 
-                fx = (dx / dist) * force
-                fy = (dy / dist) * force
-                fz = (dz / dist) * force
+                if body[cell] >= 0:
+                    # Occupied leaf: coincident nodes share it, otherwise split
+                    if size[cell] < 1e-4:
+                        mass[cell] += 1.0
+                        for c in range(3):
+                            com[cell, c] += pos[b, c]
+                        break
+                    e = body[cell]
+                    body[cell] = -1
+                    octant = 0
+                    for c in range(3):
+                        if pos[e, c] >= center[cell, c]:
+                            octant |= 1 << c
+                    child = count
+                    count += 1
+                    half = 0.5 * size[cell]
+                    size[child] = half
+                    for c in range(3):
+                        offset = 0.5 * half if octant & (1 << c) else -0.5 * half
+                        center[child, c] = center[cell, c] + offset
+                        com[child, c] = com[cell, c]
+                    mass[child] = mass[cell]
+                    body[child] = e
+                    children[cell, octant] = child
                 
-                source['x'] += fx
-                source['y'] += fy
-                source['z'] += fz
-                target['x'] -= fx
-                target['y'] -= fy
-                target['z'] -= fz
+                # Internal cell: accumulate and descend
+                mass[cell] += 1.0
+                for c in range(3):
+                    com[cell, c] += pos[b, c]
+                octant = 0
+                for c in range(3):
+                    if pos[b, c] >= center[cell, c]:
+                        octant |= 1 << c
+                child = children[cell, octant]
+                if child == -1:
+                    child = count
+                    count += 1
+                    half = 0.5 * size[cell]
+                    size[child] = half
+                    for c in range(3):
+                        offset = 0.5 * half if octant & (1 << c) else -0.5 * half
+                        center[child, c] = center[cell, c] + offset
+                    children[cell, octant] = child
+                cell = child
+        
+        # Convert accumulated position sums into centres of mass
+        for k in range(count):
+            if mass[k] > 0.0:
+                for c in range(3):
+                    com[k, c] /= mass[k]
+        
+        return com[:count], size[:count], mass[:count], children[:count]
+    
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _force_iter_bh(pos, src, tgt, repulsion, spring_len, theta):
+        """Force-directed step using Barnes-Hut far-field repulsion, in place"""
+        n = pos.shape[0]
+        com, size, mass, children = _build_octree(pos)
+        
+        forces = np.zeros((n, 3), dtype=np.float32)
+        for i in numba.prange(n):
+            fx = fy = fz = 0.0
+            stack = np.empty(8 * 64, dtype=np.int32)
+            stack[0] = 0
+            top = 1
+            while top > 0:
+                top -= 1
+                cell = stack[top]
+                dx = pos[i, 0] - com[cell, 0]
+                dy = pos[i, 1] - com[cell, 1]
+                dz = pos[i, 2] - com[cell, 2]
+                dist2 = dx*dx + dy*dy + dz*dz + 0.01
+                is_leaf = True
+                for k in range(8):
+                    if children[cell, k] >= 0:
+                        is_leaf = False
+                        break
+                if is_leaf or size[cell] * size[cell] < theta * theta * dist2:
+                    # A node's own leaf has dx = dy = dz = 0 and adds nothing
+                    inv_d = 1.0 / math.sqrt(dist2)
+                    f = repulsion * mass[cell] * inv_d * inv_d * inv_d
+                    fx += dx * f
+                    fy += dy * f
+                    fz += dz * f
+                else:
+                    for k in range(8):
+                        child = children[cell, k]
+                        if child >= 0:
+                            stack[top] = child
+                            top += 1
+            forces[i, 0] = fx
+            forces[i, 1] = fy
+            forces[i, 2] = fz
+        for i in numba.prange(n):
+            for c in range(3):
+                pos[i, c] += 0.01 * forces[i, c]
+        
+        _apply_springs(pos, src, tgt, spring_len)
+else:
+    _force_iter = _force_iter_numpy
+    _force_iter_bh = None
+
+def _layout_energy(x_flat, src, tgt, repulsion, spring_len, spring_k):
+    """Layout energy and its gradient for a flattened (3n,) position vector.
+    
+    V = sum over edges of 0.5 * k * (|xi - xj| - L)^2
+      + sum over node pairs of f0 / (0.1 + |xi - xj|)
+    """
+    pos = x_flat.reshape(-1, 3)
+    
+    # Repulsion over all pairs (each pair appears twice in the full matrix)
+    delta = pos[:, None, :] - pos[None, :, :]
+    dist = np.sqrt((delta * delta).sum(-1))
+    np.fill_diagonal(dist, 1.0)
+    denom = 0.1 + dist
+    pair_energy = repulsion / denom
+    np.fill_diagonal(pair_energy, 0.0)
+    energy = 0.5 * pair_energy.sum()
+    coef = -repulsion / (denom * denom * dist)
+    np.fill_diagonal(coef, 0.0)
+    grad = (delta * coef[..., None]).sum(axis=1)
+    
+    # Springs
+    d = pos[src] - pos[tgt]
+    edge_dist = np.sqrt((d * d).sum(-1)) + 1e-9
+    stretch = edge_dist - spring_len
+    energy += 0.5 * spring_k * (stretch * stretch).sum()
+    edge_grad = d * (spring_k * stretch / edge_dist)[:, None]
+    np.add.at(grad, src, edge_grad)
+    np.add.at(grad, tgt, -edge_grad)
+    
+    return energy, grad.ravel()
+
+def _edge_index_arrays(nodes, edges):
+    """Resolve edge endpoints to node indices once, skipping dangling edges"""
+    node_idx = {n['name']: i for i, n in enumerate(nodes)}
+    src_idx = []
+    tgt_idx = []
+    for edge in edges:
+        source = node_idx.get(edge['source'])
+        target = node_idx.get(edge['target'])
+        if source is None or target is None:
+            continue
+        src_idx.append(source)
+        tgt_idx.append(target)
+    return np.array(src_idx, dtype=np.int32), np.array(tgt_idx, dtype=np.int32)
+
+def apply_layout(nodes, edges, layout_type='force'):
+    """Apply layout algorithm"""
+    if layout_type == 'force':
+        # Positions live in a contiguous (n, 3) buffer while iterating
+        pos = np.ascontiguousarray(
+            [[n['x'], n['y'], n['z']] for n in nodes], dtype=np.float32).reshape(-1, 3)
+        src_idx, tgt_idx = _edge_index_arrays(nodes, edges)
+        
+        use_bh = _force_iter_bh is not None and len(nodes) >= BARNES_HUT_MIN_NODES
+        for _ in range(ITERATIONS):
+            if use_bh:
+                _force_iter_bh(pos, src_idx, tgt_idx, REPULSION_STRENGTH, SPRING_LENGTH,
+                               BARNES_HUT_THETA)
+            else:
+                _force_iter(pos, src_idx, tgt_idx, REPULSION_STRENGTH, SPRING_LENGTH)
+        
+        for node, (x, y, z) in zip(nodes, pos.tolist()):
+            node['x'], node['y'], node['z'] = x, y, z
+    
+    elif layout_type == 'lbfgs':
+        from scipy.optimize import minimize
+        
+        pos = np.array([[n['x'], n['y'], n['z']] for n in nodes], dtype=np.float64).reshape(-1, 3)
+        src_idx, tgt_idx = _edge_index_arrays(nodes, edges)
+        
+        result = minimize(
+            _layout_energy, pos.ravel(),
+            args=(src_idx, tgt_idx, REPULSION_STRENGTH, SPRING_LENGTH, SPRING_CONSTANT),
+            jac=True, method='L-BFGS-B', options={'maxiter': LBFGS_MAXITER}
+        )
+        print(f"  L-BFGS: {result.nit} iterations, {result.nfev} evaluations")
+        
+        for node, (x, y, z) in zip(nodes, result.x.reshape(-1, 3).tolist()):
+            node['x'], node['y'], node['z'] = x, y, z
 
 def export_json(nodes, edges, output_file):
     """Export as JSON with enhanced procedural data for Blender Geo Nodes"""
     # Pre-calculate metrics for all nodes to enable Geometry Nodes procedures
+    max_req = max(1, max((n['req_direct'] for n in nodes if n['req_direct'] > 0), default=0))
     for node in nodes:
         # Network topology metrics
         node['network_centrality'] = node['req_direct'] * node['dep_direct']
@@ -306,55 +627,74 @@ def export_json(nodes, edges, output_file):
         node['total_connections'] = node['req_direct'] + node['dep_direct']
         
         # Derived scores for procedural control
-        node['connection_influence'] = (node['req_direct'] * 0.7 + node['dep_direct'] * 0.3) / max(1, max(
-            n['req_direct'] for n in nodes if n['req_direct'] > 0
-        )) if nodes else 0
-    
-    data = {
-        'nodes': nodes,
-        'edges': edges,
-        'metadata': {
-            'layout': LAYOUT,
-            'iterations': ITERATIONS,
-            'spring_length': SPRING_LENGTH,
-            'repulsion_strength': REPULSION_STRENGTH,
-            'total_nodes': len(nodes),
-            'total_edges': len(edges)
-        }
+        node['connection_influence'] = (node['req_direct'] * 0.7 + node['dep_direct'] * 0.3) / max_req
+    
+    metadata = {
+        'layout': LAYOUT,
+        'iterations': ITERATIONS,
+        'spring_length': SPRING_LENGTH,
+        'repulsion_strength': REPULSION_STRENGTH,
+        'total_nodes': len(nodes),
+        'total_edges': len(edges)
     }
+    
+    # Stream one record per line instead of building the whole document in memory
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('{\n')
+        for key, items in (('nodes', nodes), ('edges', edges)):
+            f.write(f'  "{key}": [')
+            for i, item in enumerate(items):
+                f.write((',\n' if i else '\n') + '    ' + json.dumps(item, ensure_ascii=False))
+            f.write('\n  ],\n' if items else '],\n')
+        f.write('  "metadata": ')
+        f.write(json.dumps(metadata, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+        f.write('\n}\n')
     print(f"✓ Exported {len(nodes)} nodes and {len(edges)} edges to {output_file}")
 
 def export_obj(nodes, edges, output_file):
     """Export as Wavefront OBJ"""
+    parts = ["# Career Skills Network\n", f"# {len(nodes)} nodes, {len(edges)} edges\n\n"]
+    parts.extend(f"v {n['x']:.6f} {n['y']:.6f} {n['z']:.6f}\n" for n in nodes)
+    parts.append("\n")
+    
+    node_map = {n['name']: i+1 for i, n in enumerate(nodes)}
+    for edge in edges:
+        src_idx = node_map.get(edge['source'])
+        tgt_idx = node_map.get(edge['target'])
+        if src_idx and tgt_idx:
+            parts.append(f"l {src_idx} {tgt_idx}\n")
+    
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("# Career Skills Network\n")
-        f.write(f"# {len(nodes)} nodes, {len(edges)} edges\n\n")
-        
-        for node in nodes:
-            f.write(f"v {node['x']:.6f} {node['y']:.6f} {node['z']:.6f}\n")
-        
-        f.write("\n")
-        
-        node_map = {n['name']: i+1 for i, n in enumerate(nodes)}
-        for edge in edges:
-            src_idx = node_map.get(edge['source'])
-            tgt_idx = node_map.get(edge['target'])
-            if src_idx and tgt_idx:
-                f.write(f"l {src_idx} {tgt_idx}\n")
+        f.write(''.join(parts))
     
     print(f"✓ Exported to {output_file}")
 
 if __name__ == '__main__':
-    print("Loading network...")
-    nodes, edges = load_network(CSV_FILE)
+    cache_path = layout_cache_path(CSV_FILE) if USE_CACHE else None
     
-    print(f"\nApplying {LAYOUT} layout...")
-    apply_layout(nodes, edges, LAYOUT)
+    if cache_path and os.path.exists(cache_path):
+        print(f"Using cached layout {cache_path}")
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        nodes, edges = data['nodes'], data['edges']
+        
+        print(f"\nExporting...")
+        shutil.copyfile(cache_path, OUTPUT_JSON)
+        print(f"✓ Copied cached layout ({len(nodes)} nodes, {len(edges)} edges) to {OUTPUT_JSON}")
+    else:
+        print("Loading network...")
+        nodes, edges = load_network(CSV_FILE)
+        
+        print(f"\nApplying {LAYOUT} layout...")
+        apply_layout(nodes, edges, LAYOUT)
+        
+        print(f"\nExporting...")
+        export_json(nodes, edges, OUTPUT_JSON)
+        
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            shutil.copyfile(OUTPUT_JSON, cache_path)
     
-    print(f"\nExporting...")
-    export_json(nodes, edges, OUTPUT_JSON)
     export_obj(nodes, edges, OUTPUT_OBJ)
     
     print(f"\n✅ Done! Load {OUTPUT_JSON} in your HTML visualization.")
\ No newline at end of file
@@ -12,6 +12,23 @@ FAMILIARITY_MAP = {
     '🌱 Iniciante': 1, '❓ Desconhecida': 0, '': 0
 }
 
+# Descriptions shown in the UI for node custom properties
+PROPERTY_DESCRIPTIONS = {
+    "skill_name": "Skill identifier",
+    "req_direct": "Direct dependencies (count)",
+    "dep_direct": "Required by (count)",
+    "network_centrality": "R × D (hub importance)",
+    "foundation_efficiency": "R / (1+D) (foundation quality)",
+    "total_connections": "R + D (connectivity)",
+    "familiarity_num": "Skill level (0-5)",
+    "interest_num": "Personal interest (0-5)",
+    "market_num": "Market relevance (0-5)",
+    "req_score": "Requirement score from CSV",
+    "master_score": "Mastery score from CSV",
+    "spring_multiplier": "PROCEDURAL: Spring force multiplier",
+    "repulsion_multiplier": "PROCEDURAL: Repulsion force multiplier",
+}
+
 def load_network_json(json_path):
     """Load network data from JSON"""
     if not os.path.exists(json_path):
@@ -20,120 +37,105 @@ def load_network_json(json_path):
         data = json.load(f)
     return data['nodes'], data['edges']
 
-def create_node_object(node_data, collection):
-    """Create an individual object for each node with procedural attributes for Geo Nodes"""
-    name = node_data['name']
-    x, y, z = node_data['x'], node_data['y'], node_data['z']
-    
-    # Create a small sphere mesh for the node
+def create_node_template_mesh():
+    """Create the sphere mesh shared by every node object"""
     bpy.ops.mesh.primitive_uv_sphere_add(
         radius=NODE_SIZE,
-        location=(x, y, z),
         segments=16,
         ring_count=8
     )
+    template_obj = bpy.context.active_object
+    template_mesh = template_obj.data.copy()
+    template_mesh.name = "Skill_Node_Sphere"
+    
+    # Only the mesh datablock is kept
+    old_mesh = template_obj.data
+    bpy.data.objects.remove(template_obj, do_unlink=True)
+    bpy.data.meshes.remove(old_mesh)
+    
+    return template_mesh
+
+def create_node_object(node_data, collection, template_mesh):
+    """Create an individual object for each node with procedural attributes for Geo Nodes"""
+    name = node_data['name']
+    x, y, z = node_data['x'], node_data['y'], node_data['z']
     
-    obj = bpy.context.active_object
-    obj.name = name
+    # Instance the shared sphere mesh (avoids a bpy.ops call per node)
+    obj = bpy.data.objects.new(name, template_mesh)
+    obj.location = (x, y, z)
+    collection.objects.link(obj)
     
     # === IDENTIFIER PROPERTIES ===
-    obj["skill_name"] = name
+    props = {"skill_name": name}
     
     # === NETWORK TOPOLOGY (for spring/repulsion calculations in Geo Nodes) ===
-    obj["req_direct"] = int(node_data.get('req_direct', 0))  # Number of skills requiring this
-    obj["dep_direct"] = int(node_data.get('dep_direct', 0))  # Number of skills this depends on
-    obj["req_indirect"] = float(node_data.get('req_indirect', 0))
-    obj["dep_indirect"] = float(node_data.get('dep_indirect', 0))
+    req_direct = int(node_data.get('req_direct', 0))  # Number of skills requiring this
+    dep_direct = int(node_data.get('dep_direct', 0))  # Number of skills this depends on
+    props["req_direct"] = req_direct
+    props["dep_direct"] = dep_direct
+    props["req_indirect"] = float(node_data.get('req_indirect', 0))
+    props["dep_indirect"] = float(node_data.get('dep_indirect', 0))
     
     # === PROCEDURAL METRICS (computed values for Geo Nodes math) ===
-    obj["network_centrality"] = float(node_data.get('network_centrality', 
-        obj["req_direct"] * obj["dep_direct"]))  # R * D
-    obj["foundation_efficiency"] = float(node_data.get('foundation_efficiency',
-        obj["req_direct"] / (1 + obj["dep_direct"])))  # R / (1 + D)
-    obj["total_connections"] = float(obj["req_direct"] + obj["dep_direct"])
+    props["network_centrality"] = float(node_data.get('network_centrality', 
+        req_direct * dep_direct))  # R * D
+    props["foundation_efficiency"] = float(node_data.get('foundation_efficiency',
+        req_direct / (1 + dep_direct)))  # R / (1 + D)
+    props["total_connections"] = float(req_direct + dep_direct)
     
     # === QUALITATIVE ATTRIBUTES ===
-    obj["familiarity"] = node_data.get('familiarity', '')
-    obj["familiarity_num"] = float(FAMILIARITY_MAP.get(node_data.get('familiarity', ''), 0))
-    obj["interest"] = node_data.get('interest', '')
-    obj["interest_num"] = float(node_data.get('interest_num', 0))
-    obj["market"] = node_data.get('market', '')
-    obj["market_num"] = float(node_data.get('market_num', 0))
+    props["familiarity"] = node_data.get('familiarity', '')
+    props["familiarity_num"] = float(FAMILIARITY_MAP.get(node_data.get('familiarity', ''), 0))
+    props["interest"] = node_data.get('interest', '')
+    props["interest_num"] = float(node_data.get('interest_num', 0))
+    props["market"] = node_data.get('market', '')
+    props["market_num"] = float(node_data.get('market_num', 0))
     
     # === SCORING SYSTEMS ===
-    obj["req_score"] = float(node_data.get('req_score', 0))
-    obj["master_score"] = float(node_data.get('master_score', 0))
+    props["req_score"] = float(node_data.get('req_score', 0))
+    props["master_score"] = float(node_data.get('master_score', 0))
     
     # === POSITION DATA (useful for procedural displacement in Geo Nodes) ===
-    obj["orig_x"] = float(x)
-    obj["orig_y"] = float(y)
-    obj["orig_z"] = float(z)
+    props["orig_x"] = float(x)
+    props["orig_y"] = float(y)
+    props["orig_z"] = float(z)
     
     # === INFLUENCE MULTIPLIERS (for spring and repulsion force scaling) ===
     # These can be driven by formulas in Geo Nodes
-    obj["req_influence"] = float(node_data.get('req_score', 0)) * 0.1  # Scale requirement importance
-    obj["dep_influence"] = float(node_data.get('dep_indirect', 0)) * 0.1  # Scale dependency weight
-    obj["spring_multiplier"] = 1.0  # User-adjustable in Geo Nodes
-    obj["repulsion_multiplier"] = 1.0  # User-adjustable in Geo Nodes
-    
-    # Make properties visible in UI with descriptions
-    properties_desc = {
-        "skill_name": "Skill identifier",
-        "req_direct": "Direct dependencies (count)",
-        "dep_direct": "Required by (count)",
-        "network_centrality": "R × D (hub importance)",
-        "foundation_efficiency": "R / (1+D) (foundation quality)",
-        "total_connections": "R + D (connectivity)",
-        "familiarity_num": "Skill level (0-5)",
-        "interest_num": "Personal interest (0-5)",
-        "market_num": "Market relevance (0-5)",
-        "req_score": "Requirement score from CSV",
-        "master_score": "Mastery score from CSV",
-        "spring_multiplier": "PROCEDURAL: Spring force multiplier",
-        "repulsion_multiplier": "PROCEDURAL: Repulsion force multiplier",
-    }
-    
-    for prop, desc in properties_desc.items():
-        if prop in obj:
-            obj.id_properties_ui(prop).update(description=desc)
+    props["req_influence"] = float(node_data.get('req_score', 0)) * 0.1  # Scale requirement importance
+    props["dep_influence"] = float(node_data.get('dep_indirect', 0)) * 0.1  # Scale dependency weight
+    props["spring_multiplier"] = 1.0  # User-adjustable in Geo Nodes
+    props["repulsion_multiplier"] = 1.0  # User-adjustable in Geo Nodes
     
-    # Move to collection
-    for coll in obj.users_collection:
-        coll.objects.unlink(obj)
-    collection.objects.link(obj)
+    for key, value in props.items():
+        obj[key] = value
     
     return obj
 
-def create_edge_curve(source_obj, target_obj, edges_collection):
-    """Create a curve connecting two nodes"""
-    # Create curve data
-    curve_data = bpy.data.curves.new(name=f"{source_obj.name}_to_{target_obj.name}", type='CURVE')
-    curve_data.dimensions = '3D'
-    curve_data.bevel_depth = 0.02  # Thickness of the edge
-    
-    # Create spline
-    spline = curve_data.splines.new('BEZIER')
-    spline.bezier_points.add(1)  # Add one more point (total 2)
-    
-    # Set start point
-    spline.bezier_points[0].co = source_obj.location
-    spline.bezier_points[0].handle_left_type = 'AUTO'
-    spline.bezier_points[0].handle_right_type = 'AUTO'
-    
-    # Set end point
-    spline.bezier_points[1].co = target_obj.location
-    spline.bezier_points[1].handle_left_type = 'AUTO'
-    spline.bezier_points[1].handle_right_type = 'AUTO'
-    
-    # Create object
-    curve_obj = bpy.data.objects.new(f"Edge_{source_obj.name}_to_{target_obj.name}", curve_data)
-    edges_collection.objects.link(curve_obj)
-    
-    # Store references
-    curve_obj["source"] = source_obj.name
-    curve_obj["target"] = target_obj.name
-    
-    return curve_obj
+def describe_node_properties(node_objects):
+    """Make node properties visible in the UI with descriptions (run once after all nodes exist)"""
+    for obj in node_objects:
+        for prop, desc in PROPERTY_DESCRIPTIONS.items():
+            if prop in obj:
+                obj.id_properties_ui(prop).update(description=desc)
+        obj.update_tag()
+
+def create_edge_mesh(node_objects, edges, edges_collection):
+    """Create a single mesh holding every edge as a line segment between node locations"""
+    node_idx = {name: i for i, name in enumerate(node_objects)}
+    verts = [obj.location[:] for obj in node_objects.values()]
+    lines = [(node_idx[e['source']], node_idx[e['target']]) for e in edges
+             if e['source'] in node_idx and e['target'] in node_idx]
+    
+    mesh = bpy.data.meshes.new("Skills_Edges")
+    mesh.from_pydata(verts, lines, [])
+    mesh.update()
+    
+    # Vertex i sits on the i-th node object, in creation order
+    edge_obj = bpy.data.objects.new("Skills_Edges", mesh)
+    edges_collection.objects.link(edge_obj)
+    
+    return edge_obj, len(lines)
 
 def clear_scene():
     """Clear default objects"""
@@ -164,32 +166,23 @@ if __name__ == '__main__':
         
         # Create node objects
         print("\nCreating node objects...")
+        template_mesh = create_node_template_mesh()
         node_objects = {}
         for i, node in enumerate(nodes):
-            obj = create_node_object(node, nodes_collection)
+            obj = create_node_object(node, nodes_collection, template_mesh)
             node_objects[node['name']] = obj
             if (i + 1) % 5 == 0:
                 print(f"  Created {i + 1}/{len(nodes)} nodes...")
         
+        describe_node_properties(node_objects.values())
+        
         print(f"✓ Created {len(node_objects)} node objects")
         
-        # Create edge curves
+        # Create edge mesh
         if CREATE_EDGES:
-            print("\nCreating edge curves...")
-            edge_count = 0
-            for edge in edges:
-                source_name = edge['source']
-                target_name = edge['target']
-                
-                if source_name in node_objects and target_name in node_objects:
-                    create_edge_curve(
-                        node_objects[source_name],
-                        node_objects[target_name],
-                        edges_collection
-                    )
-                    edge_count += 1
-            
-            print(f"✓ Created {edge_count} edge curves")
+            print("\nCreating edge mesh...")
+            edge_obj, edge_count = create_edge_mesh(node_objects, edges, edges_collection)
+            print(f"✓ Created {edge_count} edges in '{edge_obj.name}'")
         
         print("\n" + "=" * 60)
         print("SUCCESS! Network imported as individual objects")
@@ -218,12 +211,12 @@ if __name__ == '__main__':
         print("  6. You can animate 'spring_multiplier' and 'repulsion_multiplier'")
         print("     to interactively control the network behavior!")
         print("\n🔗 EDGES:")
-        print("  All edges stored in 'Skills_Edges' collection (curves)")
-        print("  Can be re-created in Geo Nodes using edge data")
+        print("  All edges stored as one line-segment mesh in 'Skills_Edges' collection")
+        print("  Give them thickness in Geo Nodes with 'Mesh to Curve' → 'Curve to Mesh'")
         print("\n📁 COLLECTIONS:")
         print(f"  - Skills_Nodes: {len(node_objects)} objects")
         if CREATE_EDGES:
-            print(f"  - Skills_Edges: {edge_count} curves")
+            print(f"  - Skills_Edges: 1 mesh ({edge_count} edges)")
         print("=" * 60)
         
     except Exception as e: